@@ -8,8 +8,13 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import hashlib
 import io
+import json
+import os
+import zipfile
 
 # Import our custom modules
 from quantum_core import QuantumStateAnalyzer
@@ -25,353 +30,232 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Modern, clean CSS with high contrast and white background
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&family=Source+Code+Pro:wght@400;500&display=swap');
-    
-    /* Global reset and clean background */
-    .main .block-container {
-        background: linear-gradient(135deg, #f5f5f5 0%, #eeeeee 50%, #e8e8e8 100%);
-        padding: 2rem 1rem;
-        max-width: 1200px;
-        margin: 0 auto;
-        min-height: 100vh;
-    }
-    
-    /* Enhanced header */
-    .main-header {
-        font-size: 3.5rem;
-        font-weight: 700;
-        text-align: center;
-        background: linear-gradient(135deg, #2563eb, #7c3aed, #dc2626);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin-bottom: 0.5rem;
-        font-family: 'Poppins', sans-serif;
-        letter-spacing: -0.02em;
-    }
-    
-    .subtitle {
-        text-align: center;
-        font-size: 1.2rem;
-        color: #64748b;
-        font-weight: 400;
-        margin-bottom: 3rem;
-        font-family: 'Poppins', sans-serif;
-    }
-    
-    /* Section headers */
-    .sub-header {
-        font-size: 2rem;
-        font-weight: 600;
-        color: #1e293b;
-        margin-bottom: 1.5rem;
-        font-family: 'Poppins', sans-serif;
-        border-bottom: 3px solid #3b82f6;
-        padding-bottom: 0.5rem;
-        display: inline-block;
-    }
-    
-    /* Professional cards */
-    .content-card {
-        background: rgba(255, 255, 255, 0.95);
-        border: 1px solid #e2e8f0;
-        border-radius: 12px;
-        padding: 1.5rem;
-        margin: 0.5rem 0;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
-        transition: all 0.3s ease;
-        backdrop-filter: blur(10px);
-    }
-    
-    .content-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 10px 25px -5px rgba(0, 0, 0, 0.1), 0 10px 10px -5px rgba(0, 0, 0, 0.04);
-        border-color: #3b82f6;
-        background: rgba(255, 255, 255, 0.98);
-    }
-    
-    /* Status boxes with clear colors */
-    .info-box {
-        background: rgba(239, 246, 255, 0.9);
-        border: 1px solid #93c5fd;
-        border-left: 4px solid #3b82f6;
-        border-radius: 8px;
-        padding: 1rem 1.5rem;
-        margin: 0.5rem 0;
-        color: #1e40af;
-        font-weight: 500;
-        backdrop-filter: blur(5px);
-    }
-    
-    .success-box {
-        background: rgba(240, 253, 244, 0.9);
-        border: 1px solid #86efac;
-        border-left: 4px solid #22c55e;
-        border-radius: 8px;
-        padding: 1rem 1.5rem;
-        margin: 0.5rem 0;
-        color: #166534;
-        font-weight: 500;
-        backdrop-filter: blur(5px);
-    }
-    
-    /* Simulation completion messages */
-    .simulation-success {
-        background: linear-gradient(135deg, rgba(34, 197, 94, 0.1), rgba(22, 163, 74, 0.05));
-        border: 2px solid #22c55e;
-        border-radius: 12px;
-        padding: 1rem 1.5rem;
-        margin: 0.5rem 0;
-        box-shadow: 0 4px 6px -1px rgba(34, 197, 94, 0.1);
-        animation: slideIn 0.3s ease-out;
-    }
-    
-    .navigation-info {
-        background: linear-gradient(135deg, rgba(59, 130, 246, 0.1), rgba(37, 99, 235, 0.05));
-        border: 2px solid #3b82f6;
-        border-radius: 12px;
-        padding: 1rem 1.5rem;
-        margin: 0.5rem 0;
-        box-shadow: 0 4px 6px -1px rgba(59, 130, 246, 0.1);
-        animation: slideIn 0.3s ease-out 0.1s both;
-    }
-    
-    @keyframes slideIn {
-        from {
-            opacity: 0;
-            transform: translateY(-10px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-    
-    .warning-box {
-        background: rgba(255, 251, 235, 0.9);
-        border: 1px solid #fed7aa;
-        border-left: 4px solid #f59e0b;
-        border-radius: 8px;
-        padding: 1rem 1.5rem;
-        margin: 0.5rem 0;
-        color: #92400e;
-        font-weight: 500;
-        backdrop-filter: blur(5px);
-    }
-    
-    /* Modern buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, #3b82f6, #6366f1);
-        color: white;
-        border: none;
-        border-radius: 8px;
-        font-weight: 600;
-        font-size: 0.95rem;
-        padding: 0.75rem 1.5rem;
-        transition: all 0.2s ease;
-        box-shadow: 0 2px 4px rgba(59, 130, 246, 0.2);
-        font-family: 'Poppins', sans-serif;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-1px);
-        box-shadow: 0 4px 12px rgba(59, 130, 246, 0.3);
-        background: linear-gradient(135deg, #2563eb, #5b21b6);
-    }
-    
-    /* Sidebar clean styling */
-    .stSidebar {
-        background: linear-gradient(180deg, rgba(248, 250, 252, 0.95) 0%, rgba(241, 245, 249, 0.95) 100%);
-        border-right: 1px solid #e2e8f0;
-        backdrop-filter: blur(10px);
-    }
-    
-    .stSidebar h2 {
-        color: #1e293b !important;
-        font-family: 'Poppins', sans-serif;
-        font-weight: 600;
-    }
-    
-    /* Input fields */
-    .stTextInput > div > div > input,
-    .stNumberInput > div > div > input {
-        background: rgba(255, 255, 255, 0.9);
-        border: 2px solid #e2e8f0;
-        border-radius: 8px;
-        color: #1e293b;
-        padding: 0.75rem;
-        font-size: 0.95rem;
-        transition: border-color 0.2s ease;
-        backdrop-filter: blur(5px);
-    }
-    
-    .stTextInput > div > div > input:focus,
-    .stNumberInput > div > div > input:focus {
-        border-color: #3b82f6;
-        outline: none;
-        box-shadow: 0 0 0 3px rgba(59, 130, 246, 0.1);
-    }
-    
-    .stSelectbox > div > div {
-        background: rgba(255, 255, 255, 0.9);
-        border: 2px solid #e2e8f0;
-        border-radius: 8px;
-        color: #1e293b;
-        backdrop-filter: blur(5px);
-    }
-    
-    /* DataFrames with clean styling */
-    .stDataFrame {
-        border: 1px solid #e2e8f0;
-        border-radius: 8px;
-        overflow: hidden;
-        box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-        backdrop-filter: blur(5px);
-    }
-    
-    .stDataFrame table {
-        background: rgba(255, 255, 255, 0.9);
-        color: #1e293b;
-        font-family: 'Source Code Pro', monospace;
-    }
-    
-    .stDataFrame thead tr th {
-        background: rgba(241, 245, 249, 0.95);
-        color: #475569;
-        font-weight: 600;
-        border-bottom: 2px solid #e2e8f0;
-        padding: 1rem 0.75rem;
-    }
-    
-    .stDataFrame tbody tr:nth-child(even) {
-        background: rgba(248, 250, 252, 0.5);
-    }
-    
-    .stDataFrame tbody tr:hover {
-        background: rgba(224, 242, 254, 0.7);
-    }
-    
-    /* Metrics styling */
-    .stMetric {
-        background: rgba(255, 255, 255, 0.9);
-        border: 1px solid #e2e8f0;
-        border-radius: 8px;
-        padding: 1rem;
-        box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-        backdrop-filter: blur(5px);
-    }
-    
-    .stMetric > div {
-        color: #1e293b;
-    }
-    
-    .stMetric label {
-        color: #64748b;
-        font-weight: 500;
-    }
-    
-    /* Text styling */
-    .stMarkdown, .stText, p, li, span {
-        color: #374151 !important;
-        font-family: 'Poppins', sans-serif;
-        line-height: 1.6;
-    }
-    
-    .stMarkdown h1, .stMarkdown h2, .stMarkdown h3, .stMarkdown h4 {
-        color: #1e293b !important;
-        font-family: 'Poppins', sans-serif;
-        font-weight: 600;
-    }
-    
-    .stMarkdown strong {
-        color: #1e293b !important;
-        font-weight: 600;
-    }
-    
-    /* Code blocks */
-    .stCode {
-        background: #f1f5f9;
-        border: 1px solid #e2e8f0;
-        border-radius: 6px;
-        font-family: 'Source Code Pro', monospace;
-        color: #374151;
-    }
-    
-    /* Progress bars */
-    .stProgress > div > div > div {
-        background: linear-gradient(90deg, #3b82f6, #6366f1);
-        border-radius: 6px;
-    }
-    
-    /* Quantum badges */
-    .quantum-badge {
-        display: inline-block;
-        background: linear-gradient(135deg, #3b82f6, #6366f1);
-        color: white;
-        padding: 0.25rem 0.75rem;
-        border-radius: 16px;
-        font-size: 0.8rem;
-        font-weight: 600;
-        margin: 0.25rem 0.25rem 0.25rem 0;
-        box-shadow: 0 2px 4px rgba(59, 130, 246, 0.2);
-        font-family: 'Poppins', sans-serif;
-    }
-    
-    /* Expanders */
-    .streamlit-expanderHeader {
-        background: #f8fafc;
-        border: 1px solid #e2e8f0;
-        border-radius: 8px;
-        color: #1e293b;
-        font-weight: 500;
-    }
-    
-    /* Alert improvements */
-    .stAlert {
-        border-radius: 8px;
-        border-width: 1px;
-        font-family: 'Poppins', sans-serif;
-    }
-    
-    /* Navigation styling */
-    .stSelectbox label {
-        color: #1e293b !important;
-        font-weight: 500;
-        font-family: 'Poppins', sans-serif;
-    }
-    
-    /* Plotly containers */
-    .js-plotly-plot {
-        border-radius: 8px;
-        overflow: hidden;
-        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-        border: 1px solid #e2e8f0;
-    }
-    
-    /* Clean scrollbar */
-    ::-webkit-scrollbar {
-        width: 6px;
-        height: 6px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: #f1f5f9;
-        border-radius: 3px;
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: #cbd5e1;
-        border-radius: 3px;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: #94a3b8;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Modern, clean CSS with high contrast and white background, kept in a static
+# file and memoized so reruns don't rebuild the ~300-line string each time
+@st.cache_data(show_spinner=False)
+def _load_css() -> str:
+    """Read the app stylesheet once and cache it across reruns."""
+    css_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "app.css")
+    with open(css_path, encoding="utf-8") as f:
+        return f.read()
+
+st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
+
+# Background worker for the step-by-step state history, so simulation clicks
+# return as soon as the results are ready instead of blocking on the history
+_executor = ThreadPoolExecutor(max_workers=2)
+
+def _start_history_build():
+    """Kick off the state-history build in the background after a simulation."""
+    # Retire any build still in flight first: _build_state_history mutates
+    # the analyzer's state_history in place, so two overlapping builds would
+    # interleave entries from two circuits. Cancel it if it has not started;
+    # otherwise wait for it to finish before submitting the new one.
+    previous = st.session_state.pop('history_future', None)
+    if previous is not None and not previous.cancel():
+        try:
+            previous.result()
+        except Exception:
+            pass  # stale build's outcome is discarded either way
+    st.session_state.history_future = _executor.submit(
+        st.session_state.analyzer._build_state_history
+    )
+
+def _circuit_to_qasm(circuit) -> str:
+    """Serialize a circuit to an OpenQASM 2 string for use as a cache key."""
+    try:
+        from qiskit import qasm2
+        return qasm2.dumps(circuit)
+    except (ImportError, AttributeError):
+        # Older Qiskit versions expose qasm() directly on the circuit
+        return circuit.qasm()
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_simulate(qasm: str, shots: int = 1000):
+    """
+    Simulate a circuit described by an OpenQASM string, memoized across reruns.
+
+    Streamlit reruns the whole script on every widget interaction, so identical
+    (circuit, shots) pairs return the cached results instead of re-invoking Aer.
+    """
+    analyzer = QuantumStateAnalyzer()
+    analyzer.load_openqasm(qasm)
+    return analyzer.simulate_circuit(shots)
+
+def _downcast_results(results: dict) -> dict:
+    """
+    Downcast simulation arrays to complex64 before visualization work.
+
+    The UI shows at most 4 decimal places, so single precision is plenty and
+    the memory-bound Bloch/purity/partial-trace kernels move half the bytes.
+    """
+    sv = results.get('statevector')
+    if sv is not None:
+        results['statevector'] = np.asarray(getattr(sv, 'data', sv)).astype(np.complex64, copy=False)
+    if results.get('partial_traces'):
+        results['partial_traces'] = [
+            np.asarray(getattr(tr, 'data', tr)).astype(np.complex64, copy=False)
+            for tr in results['partial_traces']
+        ]
+    return results
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_partial_traces(sv_bytes: bytes, dtype_str: str):
+    """Per-qubit reduced density matrices, memoized on the statevector bytes."""
+    sv = np.frombuffer(sv_bytes, dtype=np.dtype(dtype_str)).astype(np.complex128)
+    return QuantumStateAnalyzer().get_partial_traces(sv)
+
+def _get_partial_traces(results: dict) -> list:
+    """
+    Partial traces for the current simulation results, computed on first use.
+
+    The analyzer no longer computes these eagerly; pages that need them pull
+    them through the statevector-keyed cache and stash them on the results
+    dict so repeat accesses within a session are free.
+    """
+    traces = results.get('partial_traces')
+    if traces:
+        return traces
+    sv = results.get('statevector')
+    if sv is None:
+        return []
+    sv = np.asarray(getattr(sv, 'data', sv))
+    traces = _cached_partial_traces(sv.tobytes(), str(sv.dtype))
+    results['partial_traces'] = traces
+    return traces
+
+def _ptrace_key(results: dict):
+    """
+    Canonical (digest, stacked-array) pair for the current partial traces.
+
+    Stacks the per-qubit density matrices into one contiguous (N, 2, 2)
+    ndarray and hashes it once per simulation, stashing both on the results
+    dict. Downstream caches then key on the short digest string instead of
+    re-serializing every density matrix on each widget interaction.
+
+    Args:
+        results: Simulation results dict held in session state
+
+    Returns:
+        Tuple of (blake2b hex digest, stacked ndarray), or (None, None)
+        when no partial traces are available
+    """
+    traces = _get_partial_traces(results)
+    if not traces:
+        return None, None
+    if 'pt_hash' not in results:
+        stack = np.ascontiguousarray(
+            np.stack([np.asarray(getattr(tr, 'data', tr)) for tr in traces])
+        )
+        results['pt_stack'] = stack
+        results['pt_hash'] = hashlib.blake2b(stack.tobytes()).hexdigest()
+    return results['pt_hash'], results['pt_stack']
+
+def _sim_hash(results: dict) -> str:
+    """
+    Digest of the simulation results, used to key the export-package cache.
+
+    Hashes the statevector's raw bytes plus the scalar result fields.
+    repr() of the whole results dict is not sound here: NumPy elides array
+    reprs past 1000 elements, so from 10 qubits up two states differing
+    only in the truncated middle would collide and serve a stale package.
+
+    Args:
+        results: Simulation results dict held in session state
+
+    Returns:
+        blake2b hex digest string
+    """
+    h = hashlib.blake2b()
+    sv = results.get('statevector')
+    if sv is not None:
+        sv = np.asarray(getattr(sv, 'data', sv))
+        h.update(str(sv.dtype).encode())
+        h.update(np.ascontiguousarray(sv).tobytes())
+    # Everything else (counts, depth, gate tallies, ...) is scalars and
+    # small dicts, where repr is exact; skip the arrays derived from the
+    # statevector and the digests stashed on the dict by _ptrace_key
+    skipped = ('statevector', 'partial_traces', 'pt_stack', 'pt_hash')
+    for key in sorted(results):
+        if key not in skipped:
+            h.update(f"{key}={results[key]!r};".encode())
+    return h.hexdigest()
+
+def _trace_bytes(density_matrix) -> bytes:
+    """Raw bytes of a 2x2 density matrix, used as a hashable cache key."""
+    dm = np.asarray(getattr(density_matrix, 'data', density_matrix), dtype=np.complex128)
+    return dm.tobytes()
+
+def _trace_from_bytes(trace_bytes: bytes) -> np.ndarray:
+    """Rebuild a 2x2 density matrix from its raw bytes."""
+    return np.frombuffer(trace_bytes, dtype=np.complex128).reshape(2, 2)
+
+# Figure caching lives here at the call sites rather than as st.cache_data
+# hash_funcs on the QuantumVisualizer methods themselves: the wrappers key on
+# density-matrix bytes / precomputed digests (cheaper than re-hashing the
+# arrays per rerun) and st.cache_resource hands back the stored figure
+# without a pickle round-trip. The figures are render-only, so sharing the
+# object across reruns is safe.
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _cached_bloch_sphere(trace_bytes: bytes, qubit_index: int, title: str = None):
+    """Build (or reuse) the Bloch sphere figure for one qubit's density matrix."""
+    return QuantumVisualizer().create_bloch_sphere(_trace_from_bytes(trace_bytes), qubit_index, title)
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _cached_bloch_sphere_vec(x: float, y: float, z: float, purity: float, qubit_index: int):
+    """Bloch sphere figure from precomputed coordinates; skips Pauli traces."""
+    return QuantumVisualizer().create_bloch_sphere_from_vec((x, y, z), purity, qubit_index)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _cached_multiqubit_bloch(pt_hash: str, _traces):
+    """Multi-qubit Bloch grid, keyed on the partial-traces digest."""
+    return QuantumVisualizer().create_multiqubit_bloch_spheres(list(_traces))
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _cached_purity_heatmap(pt_hash: str, _traces):
+    """Purity heatmap figure, keyed on the partial-traces digest."""
+    return QuantumVisualizer().create_purity_heatmap(list(_traces))
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _cached_measurement_histogram(counts_items: frozenset):
+    """Build (or reuse) the measurement histogram figure."""
+    return QuantumVisualizer().create_measurement_histogram(dict(counts_items))
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_circuit_diagram(qasm: str) -> str:
+    """Render the circuit diagram PNG once per circuit, keyed on its QASM."""
+    from qiskit import QuantumCircuit
+    return QuantumVisualizer().create_circuit_diagram(QuantumCircuit.from_qasm_str(qasm))
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _cached_export_package(sim_hash: str, _results, _traces, _circuit_info):
+    """
+    Build the complete export package once per simulation.
+
+    sim_hash keys the cache; the underscore-prefixed arguments are skipped by
+    Streamlit's hasher because they contain statevectors and density matrices.
+    """
+    return utils.create_export_package(_results, _traces, _circuit_info)
+
+def _bloch_batch(partial_traces):
+    """
+    Compute Bloch coordinates and purity for all qubits in one vectorized pass.
+
+    Stacks the 2x2 density matrices into an (N, 2, 2) array so the per-qubit
+    Pauli traces collapse to direct element accesses on a contiguous buffer.
+
+    Args:
+        partial_traces: List of 2x2 density matrices (one per qubit)
+
+    Returns:
+        Tuple of (x, y, z, purity) arrays, each of length N
+    """
+    rho = np.stack([np.asarray(getattr(tr, 'data', tr)) for tr in partial_traces])
+    x = 2 * rho[:, 0, 1].real
+    y = 2 * rho[:, 1, 0].imag
+    z = (rho[:, 0, 0] - rho[:, 1, 1]).real
+    purity = utils.batch_purity(rho)
+    return x, y, z, purity
 
 def main():
     """Main application function."""
@@ -380,6 +264,9 @@ def main():
     if 'analyzer' not in st.session_state:
         st.session_state.analyzer = QuantumStateAnalyzer()
     if 'visualizer' not in st.session_state:
+        # Per-session instance: the visualizer carries the incrementally
+        # updated state-evolution figure, which must not be shared (and
+        # mutated) across user sessions
         st.session_state.visualizer = QuantumVisualizer()
     if 'circuit_builder' not in st.session_state:
         st.session_state.circuit_builder = CircuitBuilder(st.session_state.analyzer)
@@ -398,7 +285,7 @@ def main():
         
         page = st.selectbox(
             "Choose a page:",
-            ["🏠 Home", "🔧 Circuit Builder", "⚡ Simulation", "📊 Visualization", "📈 Step-by-Step", "💾 Export", "ℹ️ About"]
+            list(PAGES)
         )
         
         # Clear simulation completed flag when navigating away from home
@@ -410,7 +297,10 @@ def main():
         # Quick actions
         if st.button("🚀 Quick Demo", type="primary"):
             st.session_state.circuit_builder._create_bell_state()
-            st.session_state.simulation_results = st.session_state.analyzer.simulate_circuit()
+            st.session_state.simulation_results = _downcast_results(_cached_simulate(
+                _circuit_to_qasm(st.session_state.analyzer.circuit)
+            ))
+            _start_history_build()
             st.rerun()
         
         if st.button("🔄 Reset All"):
@@ -453,21 +343,8 @@ def main():
                 st.write(f"Circuit gates: {len(st.session_state.analyzer.circuit.data)}")
                 st.write(f"State history entries: {len(st.session_state.analyzer.state_history) if hasattr(st.session_state.analyzer, 'state_history') else 0}")
     
-    # Page routing
-    if page == "🏠 Home":
-        show_home_page()
-    elif page == "🔧 Circuit Builder":
-        show_circuit_builder_page()
-    elif page == "⚡ Simulation":
-        show_simulation_page()
-    elif page == "📊 Visualization":
-        show_visualization_page()
-    elif page == "📈 Step-by-Step":
-        show_step_by_step_page()
-    elif page == "💾 Export":
-        show_export_page()
-    elif page == "ℹ️ About":
-        show_about_page()
+    # Page routing via the PAGES dispatch table
+    PAGES[page]()
 
 def show_home_page():
     """Display the home page with overview and quick start."""
@@ -494,13 +371,19 @@ def show_home_page():
         
         if st.button("Create Bell State Circuit", type="primary"):
             st.session_state.circuit_builder._create_bell_state()
-            st.session_state.simulation_results = st.session_state.analyzer.simulate_circuit()
+            st.session_state.simulation_results = _downcast_results(_cached_simulate(
+                _circuit_to_qasm(st.session_state.analyzer.circuit)
+            ))
+            _start_history_build()
             st.success("Bell state circuit created and simulated!")
             st.rerun()
         
         if st.button("Create GHZ State Circuit", type="secondary"):
             st.session_state.circuit_builder._create_ghz_state()
-            st.session_state.simulation_results = st.session_state.analyzer.simulate_circuit()
+            st.session_state.simulation_results = _downcast_results(_cached_simulate(
+                _circuit_to_qasm(st.session_state.analyzer.circuit)
+            ))
+            _start_history_build()
             st.success("GHZ state circuit created and simulated!")
             st.rerun()
         st.markdown('</div>', unsafe_allow_html=True)
@@ -602,10 +485,7 @@ def show_circuit_builder_page():
     
     # Check if circuit has measurements and show warning
     if st.session_state.analyzer.circuit is not None:
-        circuit_info = st.session_state.analyzer.get_circuit_info()
-        has_measurements = any('measure' in str(inst) for inst in circuit_info.get('instructions', []))
-        
-        if has_measurements:
+        if st.session_state.analyzer.has_measurements():
             st.warning("""
             ⚠️ **Circuit contains measurement operations!**
             
@@ -621,14 +501,14 @@ def show_circuit_builder_page():
         st.markdown("### 📐 Circuit Diagram")
         
         try:
-            # Create circuit diagram
-            circuit_diagram = st.session_state.visualizer.create_circuit_diagram(
-                st.session_state.analyzer.circuit
+            # Create circuit diagram (cached, so reruns skip the Matplotlib render)
+            circuit_diagram = _cached_circuit_diagram(
+                _circuit_to_qasm(st.session_state.analyzer.circuit)
             )
             
             if circuit_diagram:
-                st.image(f"data:image/png;base64,{circuit_diagram}", 
-                        caption="Quantum Circuit Diagram", use_column_width=True)
+                st.image(f"data:image/png;base64,{circuit_diagram}",
+                        caption="Quantum Circuit Diagram", width="stretch")
             else:
                 st.info("Circuit diagram could not be generated")
         except Exception as e:
@@ -642,27 +522,32 @@ def show_simulation_page():
         st.warning("⚠️ Please create a circuit first in the Circuit Builder page.")
         return
     
-    # Simulation controls
-    col1, col2, col3 = st.columns(3)
-    
+    # Simulation controls; the form batches widget edits so the script only
+    # reruns on submit instead of on every shots increment/keystroke
+    col1, col2 = st.columns([2, 1])
+
     with col1:
-        shots = st.number_input(
-            "Number of Shots",
-            min_value=100,
-            max_value=10000,
-            value=1000,
-            step=100,
-            help="Number of simulation runs"
-        )
-    
-    with col2:
-        if st.button("🚀 Run Simulation", type="primary"):
+        with st.form("sim_form"):
+            shots = st.number_input(
+                "Number of Shots",
+                min_value=100,
+                max_value=10000,
+                value=1000,
+                step=100,
+                help="Number of simulation runs"
+            )
+            submitted = st.form_submit_button("🚀 Run Simulation", type="primary")
+
+        if submitted:
             with st.spinner("Running quantum simulation..."):
-                st.session_state.simulation_results = st.session_state.analyzer.simulate_circuit(shots)
+                st.session_state.simulation_results = _downcast_results(_cached_simulate(
+                    _circuit_to_qasm(st.session_state.analyzer.circuit), shots
+                ))
+            _start_history_build()
             st.success("Simulation completed!")
             st.rerun()
-    
-    with col3:
+
+    with col2:
         if st.session_state.simulation_results:
             st.success("✅ Simulation Results Available")
         else:
@@ -676,6 +561,7 @@ def show_simulation_page():
         
         # Results summary
         st.markdown("### 📊 Simulation Results")
+        st.caption("State data is stored in single precision (complex64); displayed values are rounded to 4 decimals.")
         
         summary_df = utils.create_results_summary(st.session_state.simulation_results)
         if not summary_df.empty:
@@ -686,15 +572,26 @@ def show_simulation_page():
             st.markdown("### 📈 Measurement Results")
             
             counts = st.session_state.simulation_results['counts']
-            histogram = st.session_state.visualizer.create_measurement_histogram(counts)
-            st.plotly_chart(histogram, use_container_width=True)
+            if len(counts) <= 64:
+                # Small distributions render much faster as a native bar chart
+                # than as a full interactive Plotly figure payload
+                st.bar_chart(pd.Series(counts).sort_index())
+            else:
+                histogram = _cached_measurement_histogram(frozenset(counts.items()))
+                st.plotly_chart(histogram, use_container_width=True, key="measurement_histogram")
             
-            # Detailed counts table
-            counts_df = pd.DataFrame([
-                {'Outcome': outcome, 'Count': count, 'Probability': f"{count/sum(counts.values):.4f}"}
-                for outcome, count in counts.items()
-            ])
-            st.dataframe(counts_df, use_container_width=True)
+            # Detailed counts table, built columnar in one shot instead of per-row dicts
+            count_values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+            counts_df = pd.DataFrame({
+                'Outcome': list(counts.keys()),
+                'Count': count_values,
+                'Probability': count_values / count_values.sum()
+            })
+            st.dataframe(
+                counts_df,
+                use_container_width=True,
+                column_config={'Probability': st.column_config.NumberColumn(format="%.4f")}
+            )
         
         # State vector information
         if 'statevector' in st.session_state.simulation_results and st.session_state.simulation_results['statevector'] is not None:
@@ -725,56 +622,44 @@ def show_visualization_page():
         st.warning("⚠️ Please run a simulation first to see visualizations.")
         return
     
-    # Bloch sphere visualizations
-    if 'partial_traces' in st.session_state.simulation_results and st.session_state.simulation_results['partial_traces']:
-        partial_traces = st.session_state.simulation_results['partial_traces']
-        
+    # Bloch sphere visualizations (partial traces are derived lazily here)
+    partial_traces = _get_partial_traces(st.session_state.simulation_results)
+    if partial_traces:
         st.markdown("### 🌐 Bloch Sphere Visualizations")
         
-        # Individual Bloch spheres
+        # Individual Bloch spheres, batched into one subplot grid so the page
+        # emits a single st.plotly_chart instead of one per qubit
         st.markdown("#### Individual Qubit States")
-        
+
         num_qubits = len(partial_traces)
-        cols = min(3, num_qubits)
-        rows = (num_qubits + cols - 1) // cols
-        
+
+        # Single vectorized pass over all qubits instead of per-qubit trace math
+        bloch_x, bloch_y, bloch_z, purities = _bloch_batch(partial_traces)
+
+        pt_hash, pt_stack = _ptrace_key(st.session_state.simulation_results)
+        st.plotly_chart(_cached_multiqubit_bloch(pt_hash, pt_stack), use_container_width=True,
+                        key="bloch_grid")
+
+        metric_cols = st.columns(min(3, num_qubits))
         for i in range(num_qubits):
-            with st.container():
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    bloch_sphere = st.session_state.visualizer.create_bloch_sphere(
-                        partial_traces[i], i
-                    )
-                    st.plotly_chart(bloch_sphere, use_container_width=True)
-                
-                with col2:
-                    # Qubit analysis
-                    purity = st.session_state.analyzer.get_purity(partial_traces[i])
-                    x, y, z = st.session_state.analyzer.get_bloch_coordinates(partial_traces[i])
-                    
-                    st.markdown(f"**Qubit {i} Analysis:**")
-                    st.metric("Purity", f"{purity:.4f}")
-                    st.metric("X Coordinate", f"{x:.4f}")
-                    st.metric("Y Coordinate", f"{y:.4f}")
-                    st.metric("Z Coordinate", f"{z:.4f}")
-                    
-                    if purity > 0.99:
-                        st.success("Pure State")
-                    elif purity > 0.5:
-                        st.warning("Mixed State")
-                    else:
-                        st.error("Highly Mixed State")
-        
-        # Multi-qubit Bloch spheres
-        st.markdown("#### Multi-Qubit Bloch Spheres")
-        multi_bloch = st.session_state.visualizer.create_multiqubit_bloch_spheres(partial_traces)
-        st.plotly_chart(multi_bloch, use_container_width=True)
-        
+            with metric_cols[i % len(metric_cols)]:
+                st.markdown(f"**Qubit {i} Analysis:**")
+                st.metric("Purity", f"{purities[i]:.4f}")
+                st.metric("X Coordinate", f"{bloch_x[i]:.4f}")
+                st.metric("Y Coordinate", f"{bloch_y[i]:.4f}")
+                st.metric("Z Coordinate", f"{bloch_z[i]:.4f}")
+
+                if purities[i] > 0.99:
+                    st.success("Pure State")
+                elif purities[i] > 0.5:
+                    st.warning("Mixed State")
+                else:
+                    st.error("Highly Mixed State")
+
         # Purity heatmap
         st.markdown("#### State Purity Analysis")
-        purity_heatmap = st.session_state.visualizer.create_purity_heatmap(partial_traces)
-        st.plotly_chart(purity_heatmap, use_container_width=True)
+        purity_heatmap = _cached_purity_heatmap(pt_hash, pt_stack)
+        st.plotly_chart(purity_heatmap, use_container_width=True, key="purity_heatmap")
         
         # Qubit analysis table
         st.markdown("#### Detailed Qubit Analysis")
@@ -806,6 +691,12 @@ def show_step_by_step_page():
         st.warning("⚠️ Please run a simulation first to see step-by-step analysis.")
         return
     
+    # If a background history build is still in flight, wait for it here
+    history_future = st.session_state.pop('history_future', None)
+    if history_future is not None:
+        with st.spinner("Finalizing state history..."):
+            history_future.result()
+
     # Check if state history exists and rebuild if needed
     if not st.session_state.analyzer.state_history:
         if st.session_state.analyzer.circuit is not None:
@@ -868,73 +759,89 @@ def show_step_by_step_page():
             st.warning("⚠️ No circuit available. Please create and simulate a circuit first.")
             return
     
+    # The navigator reruns on every Previous/Next click; scope it to a fragment
+    # so only this block re-executes instead of the whole script (sidebar, CSS,
+    # page routing included).
+    _step_navigator_fragment()
+
+@st.fragment
+def _step_navigator_fragment():
+    """Render the step navigator, current-step plots, and progress table."""
     # Step navigation
     total_steps = len(st.session_state.analyzer.state_history)
-    
+
     col1, col2, col3 = st.columns([1, 2, 1])
-    
+
     with col1:
         if st.button("⏮️ Previous Step"):
             if st.session_state.current_step > 0:
                 st.session_state.current_step -= 1
-                st.rerun()
-    
+                st.rerun(scope="fragment")
+
     with col2:
         st.markdown(f"**Step {st.session_state.current_step + 1} of {total_steps}**")
         progress = (st.session_state.current_step + 1) / total_steps
         st.progress(progress)
-    
+
     with col3:
         if st.button("⏭️ Next Step"):
             if st.session_state.current_step < total_steps - 1:
                 st.session_state.current_step += 1
-                st.rerun()
-    
-    # Current step information
-    current_step_data = st.session_state.analyzer.state_history[st.session_state.current_step]
-    
+                st.rerun(scope="fragment")
+
+    # Current step information (partial traces are derived lazily per step)
+    current_step_data = st.session_state.analyzer.get_state_at_step(st.session_state.current_step)
+
     st.markdown(f"### 🔍 Step {st.session_state.current_step + 1}: {current_step_data['gate'].upper()} Gate")
-    
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
         st.markdown(f"**Gate Applied:** {current_step_data['gate'].upper()}")
         st.markdown(f"**Target Qubits:** {current_step_data['qubits']}")
-        
-        # State evolution plot for first qubit
+
+        # State evolution plot for first qubit; materialize traces only for
+        # the steps actually shown so far
         if st.session_state.current_step > 0:
             evolution_plot = st.session_state.visualizer.create_state_evolution_plot(
-                st.session_state.analyzer.state_history[:st.session_state.current_step + 1]
+                [st.session_state.analyzer.get_state_at_step(s)
+                 for s in range(st.session_state.current_step + 1)]
             )
-            st.plotly_chart(evolution_plot, use_container_width=True)
-    
+            st.plotly_chart(evolution_plot, use_container_width=True, key="state_evolution")
+
     with col2:
         # Current state Bloch spheres
         if 'partial_traces' in current_step_data:
             partial_traces = current_step_data['partial_traces']
-            
+
             st.markdown("**Current Qubit States:**")
-            
+
             for i, density_matrix in enumerate(partial_traces):
                 with st.expander(f"Qubit {i}"):
-                    bloch_sphere = st.session_state.visualizer.create_bloch_sphere(
-                        density_matrix, i, f"Qubit {i} at Step {st.session_state.current_step + 1}"
+                    bloch_sphere = _cached_bloch_sphere(
+                        _trace_bytes(density_matrix), i,
+                        f"Qubit {i} at Step {st.session_state.current_step + 1}"
                     )
-                    st.plotly_chart(bloch_sphere, use_container_width=True)
-    
+                    st.plotly_chart(bloch_sphere, use_container_width=True, key=f"step_bloch_{i}")
+
     # Step-by-step progress
     st.markdown("### 📊 Circuit Progress")
-    
-    steps_data = []
-    for i, step_data in enumerate(st.session_state.analyzer.state_history):
-        steps_data.append({
-            'Step': i + 1,
-            'Gate': step_data['gate'].upper(),
-            'Qubits': str(step_data['qubits']),
-            'Status': '✅' if i <= st.session_state.current_step else '⏳'
+
+    # The static columns only change when the state history does, so build them
+    # once and keep them in session state; only Status varies per step click.
+    hist = st.session_state.analyzer.state_history
+    if st.session_state.get('_steps_df_len') != len(hist):
+        st.session_state._steps_df = pd.DataFrame({
+            'Step': np.arange(1, len(hist) + 1),
+            'Gate': [s['gate'].upper() for s in hist],
+            'Qubits': [str(s['qubits']) for s in hist]
         })
-    
-    steps_df = pd.DataFrame(steps_data)
+        st.session_state._steps_df_len = len(hist)
+
+    steps_df = st.session_state._steps_df.copy()
+    steps_df['Status'] = np.where(
+        np.arange(len(steps_df)) <= st.session_state.current_step, '✅', '⏳'
+    )
     st.dataframe(steps_df, use_container_width=True)
 
 def show_export_page():
@@ -960,18 +867,18 @@ def show_export_page():
                 utils.create_download_button(summary_df, "results_summary", "csv")
         
         # Qubit analysis
-        if 'partial_traces' in st.session_state.simulation_results:
-            analysis_df = utils.create_qubit_analysis_table(
-                st.session_state.simulation_results['partial_traces']
-            )
+        export_traces = _get_partial_traces(st.session_state.simulation_results)
+        if export_traces:
+            analysis_df = utils.create_qubit_analysis_table(export_traces)
             if not analysis_df.empty:
                 utils.create_download_button(analysis_df, "qubit_analysis", "csv")
-        
+
         # Complete export package
         if st.session_state.analyzer.circuit is not None:
-            export_package = utils.create_export_package(
+            export_package = _cached_export_package(
+                _sim_hash(st.session_state.simulation_results),
                 st.session_state.simulation_results,
-                st.session_state.simulation_results.get('partial_traces', []),
+                export_traces,
                 st.session_state.analyzer.get_circuit_info()
             )
             utils.create_download_button(export_package, "complete_export", "json")
@@ -987,42 +894,36 @@ def show_export_page():
         """)
         
         # Bloch sphere exports
-        if 'partial_traces' in st.session_state.simulation_results:
-            partial_traces = st.session_state.simulation_results['partial_traces']
-            
+        partial_traces = _get_partial_traces(st.session_state.simulation_results)
+        if partial_traces:
+
+            # Canonical digest keys the figure builders; each figure is built
+            # once per simulation and feeds all three download buttons
+            pt_hash, pt_stack = _ptrace_key(st.session_state.simulation_results)
+
+            # One vectorized pass over the stacked density matrices gives
+            # every qubit's Bloch vector and purity; the per-qubit figure
+            # builders then receive plain floats
+            bloch_x, bloch_y, bloch_z, purities = _bloch_batch(partial_traces)
+
             # Individual Bloch spheres
             st.markdown("**Individual Bloch Spheres:**")
-            for i, density_matrix in enumerate(partial_traces):
-                bloch_sphere = st.session_state.visualizer.create_bloch_sphere(density_matrix, i)
-                col_a, col_b, col_c = st.columns(3)
-                with col_a:
-                    utils.create_download_button(bloch_sphere, f"bloch_sphere_qubit_{i}", "html")
-                with col_b:
-                    utils.create_download_button(bloch_sphere, f"bloch_sphere_qubit_{i}", "png")
-                with col_c:
-                    utils.create_download_button(bloch_sphere, f"bloch_sphere_qubit_{i}", "pdf")
+            for i in range(len(partial_traces)):
+                bloch_sphere = _cached_bloch_sphere_vec(
+                    float(bloch_x[i]), float(bloch_y[i]), float(bloch_z[i]),
+                    float(purities[i]), i
+                )
+                utils.create_download_bundle(bloch_sphere, f"bloch_sphere_qubit_{i}")
             
             # Multi-qubit Bloch spheres
             st.markdown("**Multi-Qubit Visualization:**")
-            multi_bloch = st.session_state.visualizer.create_multiqubit_bloch_spheres(partial_traces)
-            col_a, col_b, col_c = st.columns(3)
-            with col_a:
-                utils.create_download_button(multi_bloch, "multi_qubit_bloch_spheres", "html")
-            with col_b:
-                utils.create_download_button(multi_bloch, "multi_qubit_bloch_spheres", "png")
-            with col_c:
-                utils.create_download_button(multi_bloch, "multi_qubit_bloch_spheres", "pdf")
+            multi_bloch = _cached_multiqubit_bloch(pt_hash, pt_stack)
+            utils.create_download_bundle(multi_bloch, "multi_qubit_bloch_spheres")
             
             # Purity heatmap
             st.markdown("**Purity Analysis:**")
-            purity_heatmap = st.session_state.visualizer.create_purity_heatmap(partial_traces)
-            col_a, col_b, col_c = st.columns(3)
-            with col_a:
-                utils.create_download_button(purity_heatmap, "purity_heatmap", "html")
-            with col_b:
-                utils.create_download_button(purity_heatmap, "purity_heatmap", "png")
-            with col_c:
-                utils.create_download_button(purity_heatmap, "purity_heatmap", "pdf")
+            purity_heatmap = _cached_purity_heatmap(pt_hash, pt_stack)
+            utils.create_download_bundle(purity_heatmap, "purity_heatmap")
     
     # Export all at once
     st.markdown("### 🚀 Bulk Export")
@@ -1044,15 +945,58 @@ def show_export_page():
     **💡 Tip:** HTML exports are a great alternative to static images!
     """)
     
-    if st.button("📦 Export Everything", type="primary"):
-        st.info("📋 All export options are available above. Use the individual download buttons to save specific files.")
-        st.markdown("""
-        **Quick Export Guide:**
-        1. **Data Analysis**: Use CSV/JSON exports for data
-        2. **Visualizations**: Use HTML exports (always work) or PNG/PDF (if kaleido installed)
-        3. **Sharing**: HTML files can be opened in any web browser
-        4. **Publications**: Try HTML first, then install kaleido for PNG/PDF if needed
-        """)
+    st.download_button(
+        "📦 Export Everything (ZIP)",
+        data=_bulk_zip_bytes,
+        file_name="qtrace_export.zip",
+        mime="application/zip",
+        type="primary",
+        help="Bundle all data exports and HTML visualizations into one archive"
+    )
+
+def _bulk_zip_bytes() -> bytes:
+    """
+    Build the everything-in-one ZIP archive for the bulk export button.
+
+    Passed as a callable to st.download_button, so nothing here runs until
+    the user actually clicks — page renders never pay for the archive. The
+    figure builders and serializers are the cached helpers, so assets shared
+    with the individual download buttons are not rebuilt.
+
+    Returns:
+        Raw bytes of the ZIP archive
+    """
+    results = st.session_state.simulation_results
+    traces = _get_partial_traces(results)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        summary_df = utils.create_results_summary(results)
+        if not summary_df.empty:
+            archive.writestr("results_summary.csv", summary_df.to_csv(index=False))
+
+        if traces:
+            analysis_df = utils.create_qubit_analysis_table(traces)
+            if not analysis_df.empty:
+                archive.writestr("qubit_analysis.csv", analysis_df.to_csv(index=False))
+
+            pt_hash, pt_stack = _ptrace_key(results)
+            for i, dm in enumerate(pt_stack):
+                fig = _cached_bloch_sphere(_trace_bytes(dm), i)
+                archive.writestr(f"bloch_sphere_qubit_{i}.html",
+                                 fig.to_html(include_plotlyjs='cdn'))
+            archive.writestr("multi_qubit_bloch_spheres.html",
+                             _cached_multiqubit_bloch(pt_hash, pt_stack).to_html(include_plotlyjs='cdn'))
+            archive.writestr("purity_heatmap.html",
+                             _cached_purity_heatmap(pt_hash, pt_stack).to_html(include_plotlyjs='cdn'))
+
+        if st.session_state.analyzer.circuit is not None:
+            package = _cached_export_package(
+                _sim_hash(results), results, traces,
+                st.session_state.analyzer.get_circuit_info()
+            )
+            archive.writestr("complete_export.json",
+                             json.dumps(package, indent=2, default=str))
+    return buffer.getvalue()
 
 def show_about_page():
     """Display the about page."""
@@ -1137,5 +1081,18 @@ def show_about_page():
     4. Check that your quantum circuit is valid
     """)
 
+# Page routing table: dict dispatch instead of a 7-branch if/elif chain.
+# All pages live in this module, so the lookup resolves in O(1) with no
+# per-selection imports.
+PAGES = {
+    "🏠 Home": show_home_page,
+    "🔧 Circuit Builder": show_circuit_builder_page,
+    "⚡ Simulation": show_simulation_page,
+    "📊 Visualization": show_visualization_page,
+    "📈 Step-by-Step": show_step_by_step_page,
+    "💾 Export": show_export_page,
+    "ℹ️ About": show_about_page,
+}
+
 if __name__ == "__main__":
     main()
@@ -4,9 +4,53 @@ Provides a user-friendly interface for building quantum circuits.
 """
 
 import streamlit as st
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
+from qiskit import QuantumCircuit, transpile
 from quantum_core import QuantumStateAnalyzer
 
+# Quick-circuit templates as OpenQASM constants: one cached parser call per
+# template replaces the per-gate Python dispatch through analyzer.add_gate
+_BELL_QASM = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[2];
+creg c[2];
+h q[0];
+cx q[0],q[1];
+"""
+
+_GHZ_QASM = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[3];
+creg c[3];
+h q[0];
+cx q[0],q[1];
+cx q[1],q[2];
+"""
+
+# Bell pair on q[1]/q[2], then the teleportation Bell measurement on q[0]/q[1]
+_TELEPORTATION_QASM = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[3];
+creg c[3];
+h q[1];
+cx q[1],q[2];
+cx q[0],q[1];
+h q[0];
+"""
+
+@lru_cache(maxsize=None)
+def _parse(qasm: str) -> QuantumCircuit:
+    """Parse a QASM template once; repeat calls reuse the parsed circuit."""
+    return QuantumCircuit.from_qasm_str(qasm)
+
+# Build and transpile each fixed template once at import time; button presses
+# then hand out cheap copies instead of re-running gate addition plus a
+# level-2 transpile pass
+_BELL = transpile(_parse(_BELL_QASM), optimization_level=2)
+_GHZ = transpile(_parse(_GHZ_QASM), optimization_level=2)
+_TELEPORTATION = transpile(_parse(_TELEPORTATION_QASM), optimization_level=2)
+
 class CircuitBuilder:
     """Interactive circuit builder interface for QTrace."""
     
@@ -228,30 +272,26 @@ class CircuitBuilder:
         
         return False
     
+    def _install_template(self, template: QuantumCircuit):
+        """Install a copy of a pre-built template as the analyzer's circuit."""
+        # copy() so sessions never mutate the shared module-level template
+        self.analyzer.circuit = template.copy()
+        self.analyzer.state_history = []
+        self.analyzer.current_step = 0
+
     def _create_bell_state(self):
         """Create a Bell state circuit."""
-        self.analyzer.create_circuit(2)
-        self.analyzer.add_gate('h', 0)
-        self.analyzer.add_gate('cx', 0, 1)
+        self._install_template(_BELL)
         st.success("Bell state circuit created! (H on q[0], CNOT with q[0] control, q[1] target)")
-    
+
     def _create_ghz_state(self):
         """Create a GHZ state circuit."""
-        self.analyzer.create_circuit(3)
-        self.analyzer.add_gate('h', 0)
-        self.analyzer.add_gate('cx', 0, 1)
-        self.analyzer.add_gate('cx', 1, 2)
+        self._install_template(_GHZ)
         st.success("GHZ state circuit created! (H on q[0], CNOT chain)")
-    
+
     def _create_teleportation_circuit(self):
         """Create a quantum teleportation circuit."""
-        self.analyzer.create_circuit(3)
-        # Create Bell state between q[1] and q[2]
-        self.analyzer.add_gate('h', 1)
-        self.analyzer.add_gate('cx', 1, 2)
-        # Teleport q[0] to q[2]
-        self.analyzer.add_gate('cx', 0, 1)
-        self.analyzer.add_gate('h', 0)
+        self._install_template(_TELEPORTATION)
         st.success("Quantum teleportation circuit created!")
     
     def render_circuit_operations(self) -> bool:
@@ -273,6 +313,8 @@ class CircuitBuilder:
             if st.button("Add Measurement", help="Add measurement gates to all qubits"):
                 for i in range(self.analyzer.circuit.num_qubits):
                     self.analyzer.circuit.measure(i, i)
+                # In-place mutation: invalidate the cached circuit info
+                self.analyzer._circuit_version += 1
                 st.success("Measurement gates added!")
                 return True
         
@@ -312,7 +354,7 @@ class CircuitBuilder:
             'depth': circuit_info.get('depth', 0),
             'total_gates': sum(circuit_info.get('gate_counts', {}).values()),
             'gate_breakdown': circuit_info.get('gate_counts', {}),
-            'has_measurements': any('measure' in str(inst) for inst in circuit_info.get('instructions', []))
+            'has_measurements': 'measure' in self.analyzer.circuit.count_ops()
         }
         
         return summary
@@ -3,15 +3,22 @@ Bell State Example Circuit
 Creates the entangled state (|00⟩ + |11⟩)/√2
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
 from qiskit import QuantumCircuit
 from qiskit_aer import AerSimulator
 from qiskit.quantum_info import Statevector
 import numpy as np
 
+@lru_cache(maxsize=1)
 def create_bell_state_circuit():
     """
     Create a Bell state circuit.
-    
+
+    The circuit is deterministic, so it is built once per process; don't
+    mutate the returned object (copy it first if you need to).
+
     Returns:
         QuantumCircuit: The Bell state circuit
     """
@@ -29,12 +36,17 @@ def create_bell_state_circuit():
     
     return qc
 
+@lru_cache(maxsize=1)
 def simulate_bell_state():
     """
     Simulate the Bell state circuit and show results.
-    
+
+    Takes no parameters, so the heavy Aer runs happen once per process and
+    repeat calls are dict lookups. The result is read-only to keep the
+    cached entry intact.
+
     Returns:
-        dict: Simulation results
+        MappingProxyType: Read-only simulation results
     """
     # Create the circuit
     qc = create_bell_state_circuit()
@@ -47,21 +59,20 @@ def simulate_bell_state():
     # Get the counts
     counts = result.get_counts(qc)
     
-    # Get the statevector (before measurement)
+    # Get the statevector (before measurement) by direct numpy evolution —
+    # no backend job/result round-trip for a circuit this small
     qc_no_measure = QuantumCircuit(2)
     qc_no_measure.h(0)
     qc_no_measure.cx(0, 1)
+
+    statevector = Statevector.from_instruction(qc_no_measure).data
     
-    statevector_job = backend.run(qc_no_measure, shots=1)
-    statevector_result = statevector_job.result()
-    statevector = statevector_result.get_statevector()
-    
-    return {
+    return MappingProxyType({
         'circuit': qc,
         'counts': counts,
         'statevector': statevector,
         'expected_state': '(|00⟩ + |11⟩)/√2'
-    }
+    })
 
 def analyze_bell_state():
     """
@@ -75,18 +86,16 @@ def analyze_bell_state():
     print(f"State vector: {results['statevector']}")
     print(f"Measurement counts: {results['counts']}")
     
-    # Calculate entanglement
-    statevector = results['statevector']
-    rho = np.outer(statevector, statevector.conj())
-    
-    # Partial trace over qubit 1 to get reduced density matrix of qubit 0
-    rho_0 = np.array([
-        [rho[0, 0] + rho[1, 1], rho[0, 2] + rho[1, 3]],
-        [rho[2, 0] + rho[3, 1], rho[2, 2] + rho[3, 3]]
-    ])
-    
-    # Calculate purity of reduced state
-    purity = np.real(np.trace(rho_0 @ rho_0))
+    # Calculate entanglement without materializing the full density matrix:
+    # for a pure state the reduced density matrix of qubit 0 is M @ M† with
+    # the statevector viewed as a 2x2 matrix
+    statevector = np.asarray(results['statevector'])
+    M = statevector.reshape(2, 2)
+    rho_0 = M @ M.conj().T
+
+    # Calculate purity of reduced state; for Hermitian rho,
+    # Tr(rho @ rho) == sum(|rho_ij|^2)
+    purity = np.vdot(rho_0, rho_0).real
     print(f"Purity of qubit 0 (should be 0.5 for maximally entangled): {purity:.4f}")
     
     if abs(purity - 0.5) < 0.01:
@@ -181,21 +181,17 @@ def demonstrate_entanglement():
     qc_bell.h(0)
     qc_bell.cx(0, 1)
     
-    backend = Aer.get_backend('aer_simulator')
-    job = execute(qc_bell, backend, shots=1)
-    result = job.result()
-    bell_statevector = result.get_statevector()
+    bell_statevector = Statevector.from_instruction(qc_bell).data
     
     print("Bell state between qubits 1 and 2:")
     print(f"State vector: {bell_statevector}")
     
-    # Calculate reduced density matrix of qubit 1
-    rho = np.outer(bell_statevector, bell_statevector.conj())
-    rho_1 = np.array([
-        [rho[0, 0] + rho[1, 1], rho[0, 2] + rho[1, 3]],
-        [rho[2, 0] + rho[3, 1], rho[2, 2] + rho[3, 3]]
-    ])
-    
+    # Calculate reduced density matrix of qubit 1 without materializing the
+    # full 4^n density matrix: view the pure state as a 2x2 matrix M and
+    # contract once, rho_1 = M @ M† (memory stays O(2^n) instead of O(4^n))
+    M = np.asarray(bell_statevector).reshape(2, 2)
+    rho_1 = M @ M.conj().T
+
     purity = np.real(np.trace(rho_1 @ rho_1))
     print(f"Purity of qubit 1: {purity:.4f}")
     print("Expected: 0.5 (maximally mixed due to entanglement)")